@@ -8,6 +8,8 @@ from googletrans import Translator
 from tqdm import tqdm
 import html
 
+import output_writer
+
 # Configuration
 INPUT_FILE = "input_documents/ACBP.json"
 TARGET_LANGUAGES = {
@@ -134,8 +136,7 @@ async def translate_language(original_data, lang_code, lang_name, total_items, o
         await traverse_and_translate(translated_data, lang_code, pbar)
 
     # Save
-    with open(output_filename, 'w', encoding='utf-8') as f:
-        json.dump(translated_data, f, indent=4, ensure_ascii=False)
+    output_writer.write_atomic(output_filename, translated_data)
     print(f"Saved translated JSON to {output_filename}")
 
 async def main():
@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import threading
+from typing import Any
+
+# orjson is optional: when installed it is used for any document it encodes
+# byte-for-byte like json.dumps(indent=4, ensure_ascii=False); otherwise the
+# standard library does the work.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _double_indent(payload: bytes) -> bytes:
+    """
+    Turns orjson's 2-space indentation into the 4 spaces json.dump(indent=4) uses.
+    JSON strings cannot hold raw newlines or control bytes, so every "\\n" plus
+    spaces is indentation, and \\x01 is free to mark levels already rewritten.
+    """
+    depth = 1
+    while b"\n" + b"  " * depth in payload:
+        depth += 1
+    for level in range(depth - 1, 0, -1):
+        payload = payload.replace(b"\n" + b"  " * level, b"\n" + b"\x01" * level)
+    return payload.replace(b"\x01", b"    ")
+
+def _orjson_compatible(data: Any) -> bool:
+    """
+    True if orjson output for data matches the standard library exactly: plain
+    dicts with str keys, lists, str, bool, None and 64-bit ints. Floats are left
+    to the standard library since the two format some of them differently.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            for key, item in value.items():
+                if type(key) is not str:
+                    return False
+                stack.append(item)
+        elif kind is list:
+            stack.extend(value)
+        elif kind is int:
+            if not -2**63 <= value < 2**64:
+                return False
+        elif kind not in (str, bool, type(None)):
+            return False
+    return True
+
+def serialize(data: Any, compact: bool = False) -> bytes:
+    """
+    Encodes data as UTF-8 JSON, indented by 4 like the existing output files,
+    or without whitespace when compact is set.
+    """
+    if orjson is not None and _orjson_compatible(data):
+        try:
+            if compact:
+                return orjson.dumps(data)
+            return _double_indent(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        except orjson.JSONEncodeError:
+            pass  # e.g. lone surrogates; let the standard library report them
+
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, indent=4, ensure_ascii=False)
+    return text.encode('utf-8')
+
+def write_atomic(path: str, data: Any, compact: bool = False, gzip_output: bool = False,
+                 fsync: bool = True) -> str:
+    """
+    Serializes data to a temporary file next to path and renames it into place,
+    so a crash never leaves a truncated output. Returns the path written, which
+    gains a .gz suffix when gzip_output is set; a copy of path in the other
+    format is removed so readers never pick up a stale one. fsync=False skips
+    the flush to disk for small files rewritten very often.
+    """
+    payload = serialize(data, compact)
+    stale_path = path
+    if gzip_output:
+        path += ".gz"
+        payload = gzip.compress(payload, mtime=0)
+    else:
+        stale_path = path + ".gz"
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'xb') as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if os.path.exists(stale_path):
+        os.remove(stale_path)
+    return path
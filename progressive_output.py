@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from typing import Dict, Any, List
+
+import output_writer
+import translation_plan
+
+# Record orderings for progressive runs:
+#   input      - the order of the input file
+#   sort_order - by each record's "sort_order" field (the ACBP priority)
+#   shortest   - fewest characters to translate first, so short records such as
+#                single-designation entries show up within minutes
+RECORD_ORDERS = ["input", "sort_order", "shortest"]
+
+def progressive_paths(output_dir: str, lang_code: str) -> Dict[str, str]:
+    """
+    Returns the append-only JSONL, index and final JSON paths for one language.
+    """
+    return {
+        "records": os.path.join(output_dir, f"ACBP_{lang_code}.partial.jsonl"),
+        "index": os.path.join(output_dir, f"ACBP_{lang_code}.index.json"),
+        "final": os.path.join(output_dir, f"ACBP_{lang_code}.json"),
+    }
+
+def order_records(records: List[Any], order: str, translate_keys: List[str] = None) -> List[int]:
+    """
+    Returns record positions in the order they should be translated and emitted.
+    translate_keys decides which fields count towards a record's length for "shortest".
+    """
+    positions = list(range(len(records)))
+    if order == "sort_order":
+        def priority(i):
+            value = records[i].get("sort_order") if isinstance(records[i], dict) else None
+            return (value is None, value if isinstance(value, (int, float)) else 0, i)
+        positions.sort(key=priority)
+    elif order == "shortest":
+        positions.sort(key=lambda i: (sum(len(s) for s in translation_plan.extract_segments(records[i], translate_keys)), i))
+    elif order != "input":
+        raise ValueError(f"Unknown record order {order!r}, expected one of {RECORD_ORDERS}")
+    return positions
+
+def record_fingerprint(record: Any) -> str:
+    """
+    SHA-256 of a source record, stored with each emitted line so a resumed run
+    can tell whether the input changed since the line was written.
+    """
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def load_progress(records_path: str, records: List[Any]) -> Dict[str, Dict[int, Any]]:
+    """
+    Reads records already emitted by an earlier, interrupted run and returns
+    {"records": {index: record}, "offsets": {index: byte offset}}. A torn last
+    line from a crash is cut off so its record is translated again, and lines
+    whose source fingerprint no longer matches records (the input was
+    re-exported, or shrank) are dropped from the file.
+    """
+    progress = {"records": {}, "offsets": {}}
+    if not os.path.exists(records_path):
+        return progress
+    kept = []
+    kept_length = 0
+    stale = 0
+    torn = False
+    with open(records_path, 'rb') as f:
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete line")
+                entry = json.loads(line)
+                index, record = entry["index"], entry["record"]
+            except (ValueError, KeyError, TypeError):
+                torn = True
+                break
+            if not (isinstance(index, int) and 0 <= index < len(records)) \
+                    or entry.get("source") != record_fingerprint(records[index]):
+                stale += 1
+                continue
+            progress["records"][index] = record
+            progress["offsets"][index] = kept_length
+            kept.append(line)
+            kept_length += len(line)
+
+    if stale:
+        print(f"Discarding {stale} records from {records_path}: the input changed since they were translated")
+    if stale or torn:
+        tmp_path = records_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.writelines(kept)
+        os.replace(tmp_path, records_path)
+    return progress
+
+def append_record(f, index: int, record: Any, source: Any) -> int:
+    """
+    Appends one finished record, tagged with the fingerprint of its source
+    record, to the open JSONL file and flushes it so readers see it straight
+    away. Returns the byte offset the line starts at.
+    """
+    offset = f.tell()
+    entry = {"index": index, "source": record_fingerprint(source), "record": record}
+    f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+    f.flush()
+    return offset
+
+def write_index(index_path: str, lang_code: str, total: int, offsets: Dict[int, int]):
+    """
+    Writes the small index consumers poll: how many records are done and where
+    each one starts in the JSONL file. Replaced atomically so it is never half written.
+    """
+    index = {
+        "language": lang_code,
+        "total_records": total,
+        "completed_records": len(offsets),
+        "offsets": {str(i): offset for i, offset in offsets.items()},
+    }
+    # Rewritten after every record, so skip fsync; the JSONL is the source of truth
+    output_writer.write_atomic(index_path, index, fsync=False)
+
+def compact(paths: Dict[str, str], records: List[Any], compact_json: bool = False, gzip_output: bool = False) -> str:
+    """
+    Rebuilds the records in input order from the JSONL, writes the normal
+    ACBP_{lang}.json and removes the progressive files. Returns the path written.
+    """
+    total = len(records)
+    done = load_progress(paths["records"], records)["records"]
+    missing = [i for i in range(total) if i not in done]
+    if missing:
+        raise ValueError(f"Cannot compact {paths['records']}: records {missing} are not translated yet")
+
+    translated_data = [done[i] for i in range(total)]
+    final_path = output_writer.write_atomic(paths["final"], translated_data, compact_json, gzip_output)
+
+    for key in ("records", "index"):
+        if os.path.exists(paths[key]):
+            os.remove(paths[key])
+    return final_path
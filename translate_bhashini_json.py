@@ -1,3 +1,5 @@
+import argparse
+import concurrent.futures
 import json
 import os
 import requests
@@ -6,6 +8,10 @@ import time
 from typing import Dict, Any, List
 from tqdm import tqdm
 
+import output_writer
+import progressive_output
+import translation_plan
+
 # added exception if tqdm is not installed
 # try:
 #     from tqdm import tqdm
@@ -71,9 +77,8 @@ load_env()
 USER_ID = os.environ.get("BHASHINI_USER_ID")
 API_KEY = os.environ.get("BHASHINI_API_KEY")
 
-if not USER_ID or not API_KEY:
-    print("Error: BHASHINI_USER_ID and BHASHINI_API_KEY must be set in .env file or environment variables.")
-    exit(1)
+# Compute API timings for the current language, saved for translation_plan estimates
+request_stats = {"requests": 0, "seconds": 0.0}
 
 def get_pipeline_config(source_lang: str, target_lang: str) -> Dict:
     """
@@ -167,7 +172,10 @@ def translate_text(text: str, config: Dict, compute_url: str) -> str:
     }
 
     try:
+        started = time.perf_counter()
         response = requests.post(compute_url, json=payload, headers=headers)
+        request_stats["requests"] += 1
+        request_stats["seconds"] += time.perf_counter() - started
         response.raise_for_status()
         data = response.json()
         translated_text = data["pipelineResponse"][0]["output"][0]["target"]
@@ -228,7 +236,63 @@ def traverse_and_translate(data: Any, config: Dict, compute_url: str, pbar=None)
         for item in data:
             traverse_and_translate(item, config, compute_url, pbar)
 
+def translate_progressively(records: List[Any], lang_code: str, config: Dict, compute_url: str,
+                            output_dir: str, order: str, pbar=None) -> Dict[str, str]:
+    """
+    Translates one record at a time and appends each finished record to an
+    append-only JSONL file with a small index, resuming from an earlier
+    interrupted run. Returns the paths to hand to progressive_output.compact.
+    """
+    paths = progressive_output.progressive_paths(output_dir, lang_code)
+    progress = progressive_output.load_progress(paths["records"], records)
+    done, offsets = progress["records"], progress["offsets"]
+    if done:
+        print(f"Resuming: {len(done)} of {len(records)} records already in {paths['records']}")
+
+    with open(paths["records"], 'ab') as f:
+        for i in progressive_output.order_records(records, order, TRANSLATE_KEYS):
+            if i in done:
+                if pbar: pbar.update(count_translatable_items(records[i]))
+                continue
+            record = copy.deepcopy(records[i])
+            traverse_and_translate(record, config, compute_url, pbar)
+            offsets[i] = progressive_output.append_record(f, i, record, records[i])
+            progressive_output.write_index(paths["index"], lang_code, len(records), offsets)
+
+    return paths
+
+def report_saves(pending: Dict, wait: bool = False) -> bool:
+    """
+    Reports background writes that have finished (all of them when wait is set)
+    and removes them from pending. Returns False if any of them failed.
+    """
+    finished = list(pending) if wait else [future for future in pending if future.done()]
+    ok = True
+    for future in finished:
+        lang_name = pending.pop(future)
+        try:
+            print(f"Saved translated JSON to {future.result()}")
+        except Exception as e:
+            print(f"Error saving {lang_name} output: {e}")
+            ok = False
+    return ok
+
 def main():
+    parser = argparse.ArgumentParser(description="Translate ACBP JSON with the Bhashini API.")
+    parser.add_argument("--plan", action="store_true",
+                        help="Report the workload and cost per provider and language without calling any API")
+    parser.add_argument("--progressive", action="store_true",
+                        help="Emit each record to ACBP_{lang}.partial.jsonl as soon as it is translated")
+    parser.add_argument("--order", choices=progressive_output.RECORD_ORDERS, default="input",
+                        help="Record order for --progressive (default: input)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write output JSON without indentation")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Gzip output files (written as ACBP_{lang}.json.gz)")
+    parser.add_argument("--write-workers", type=int, default=4,
+                        help="Threads serializing finished languages in the background (default: 4)")
+    args = parser.parse_args()
+
     if not os.path.exists(INPUT_FILE):
         print(f"Input file {INPUT_FILE} not found.")
         return
@@ -237,45 +301,84 @@ def main():
     with open(INPUT_FILE, 'r', encoding='utf-8') as f:
         original_data = json.load(f)
 
+    if args.plan:
+        translation_plan.print_plan(translation_plan.build_plan(
+            original_data, languages=list(TARGET_LANGUAGES), translate_keys=TRANSLATE_KEYS))
+        return
+
+    if not USER_ID or not API_KEY:
+        print("Error: BHASHINI_USER_ID and BHASHINI_API_KEY must be set in .env file or environment variables.")
+        exit(1)
+
+    if args.progressive and not isinstance(original_data, list):
+        print("Error: --progressive needs the input file to be a JSON list of records.")
+        exit(1)
+
     # Calculate total items to translate for the first pass (assuming structure matches)
     print("Calculating translation workload...")
     total_items = count_translatable_items(original_data)
     print(f"Total items to translate per language: {total_items}")
 
-    for lang_code, lang_name in TARGET_LANGUAGES.items():
-        print(f"\n--- Starting translation for {lang_name} ({lang_code}) ---")
-        
-        # 1. Get Pipeline Config
-        print("Fetching pipeline configuration...")
-        config = get_pipeline_config("en", lang_code)
-        if not config:
-            print(f"Skipping {lang_name} due to config failure.")
-            continue
+    # Finished languages are serialized and renamed into place in the background
+    # while the next language is being translated
+    saved_all = True
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.write_workers)) as writer:
+        pending = {}
+        for lang_code, lang_name in TARGET_LANGUAGES.items():
+            if not report_saves(pending):
+                print("Stopping early so no more quota is spent on output that cannot be saved.")
+                saved_all = False
+                break
 
-        try:
-           compute_url = config["pipelineInferenceAPIEndPoint"]["callbackUrl"]
-        except KeyError:
-           print("Could not find callbackUrl in config response.")
-           continue
-
-        # 2. Deep Copy Data
-        translated_data = copy.deepcopy(original_data)
-
-        # 3. Translate with Progress Bar
-        with tqdm(total=total_items, desc=f"Translating to {lang_name}", unit="item") as pbar:
-            traverse_and_translate(translated_data, config, compute_url, pbar)
-
-        # 4. Save
-        output_dir = "translated_files"
-        os.makedirs(output_dir, exist_ok=True)
-        output_filename = os.path.join(output_dir, f"ACBP_{lang_code}.json")
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, indent=4, ensure_ascii=False)
-        print(f"Saved translated JSON to {output_filename}")
-        
-        # Delay between languages
-        print("Waiting 15 seconds before next language...")
-        time.sleep(15)
+            print(f"\n--- Starting translation for {lang_name} ({lang_code}) ---")
+            
+            # 1. Get Pipeline Config
+            print("Fetching pipeline configuration...")
+            config = get_pipeline_config("en", lang_code)
+            if not config:
+                print(f"Skipping {lang_name} due to config failure.")
+                continue
+
+            try:
+               compute_url = config["pipelineInferenceAPIEndPoint"]["callbackUrl"]
+            except KeyError:
+               print("Could not find callbackUrl in config response.")
+               continue
+
+            output_dir = "translated_files"
+            os.makedirs(output_dir, exist_ok=True)
+            output_filename = os.path.join(output_dir, f"ACBP_{lang_code}.json")
+
+            # 2. Translate with Progress Bar
+            request_stats.update(requests=0, seconds=0.0)
+            with tqdm(total=total_items, desc=f"Translating to {lang_name}", unit="item") as pbar:
+                if args.progressive:
+                    # Records are saved as they finish, then compacted into output_filename
+                    paths = translate_progressively(original_data, lang_code, config, compute_url,
+                                                    output_dir, args.order, pbar)
+                else:
+                    translated_data = copy.deepcopy(original_data)
+                    traverse_and_translate(translated_data, config, compute_url, pbar)
+            translation_plan.record_latency("bhashini", request_stats["seconds"], request_stats["requests"])
+
+            # 3. Save
+            if args.progressive:
+                future = writer.submit(progressive_output.compact, paths, original_data,
+                                       args.compact, args.gzip)
+            else:
+                future = writer.submit(output_writer.write_atomic, output_filename, translated_data,
+                                       args.compact, args.gzip)
+            pending[future] = lang_name
+            
+            # Delay between languages
+            print("Waiting 15 seconds before next language...")
+            time.sleep(15)
+
+        if not report_saves(pending, wait=True):
+            saved_all = False
+
+    if not saved_all:
+        exit(1)
 
 if __name__ == "__main__":
     main()
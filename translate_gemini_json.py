@@ -7,6 +7,8 @@ from google.cloud import translate_v2 as translatek
 from tqdm import tqdm
 import html
 
+import output_writer
+
 
 
 # Try importing tqdm for progress bars
@@ -203,8 +205,7 @@ def main():
         output_dir = "google_translated_files"
         os.makedirs(output_dir, exist_ok=True)
         output_filename = os.path.join(output_dir, f"ACBP_{lang_code}.json")
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(translated_data, f, indent=4, ensure_ascii=False)
+        output_writer.write_atomic(output_filename, translated_data)
         print(f"Saved translated JSON to {output_filename}")
 
 if __name__ == "__main__":
@@ -0,0 +1,350 @@
+import argparse
+import gzip
+import json
+import math
+import os
+from typing import Dict, Any, List, Optional
+
+import output_writer
+
+# Configuration
+INPUT_FILE = "input_documents/ACBP.json"
+# TARGET_LANGUAGES and TRANSLATE_KEYS are defaults for standalone runs;
+# translate_bhashini_json.py passes its own so --plan follows what it translates.
+TARGET_LANGUAGES = {
+    "hi": "Hindi",
+    "te": "Telugu",
+    "kn": "Kannada",
+    "mr": "Marathi",
+    "ta": "Tamil",
+    "gu": "Gujarati",
+    "ml": "Malayalam",
+    "or": "Oriya",
+    "pa": "Punjabi",
+    "bn": "Bengali",
+    "as": "Assamese",
+}
+
+# Keys to translate
+TRANSLATE_KEYS = [
+    # "instruction",
+    "role_responsibilities",
+    "activities",
+    "rationale",
+    # "course",
+    "designation_name",
+    "wing_division_section",
+    # "theme",
+    # "sub_theme",
+    # "competencyThemeName",
+    # "competencySubThemeName",
+    # "organisation",
+    # "status",
+    # "state_center_name",
+    # "department_name"
+]
+
+# How each translation script talks to its provider. Values mirror the scripts:
+# one segment per request, no de-duplication and no reuse of earlier outputs.
+# latency_seconds / requests_per_minute are defaults, overridable through
+# <PREFIX>_LATENCY_SECONDS, <PREFIX>_REQUESTS_PER_MINUTE and <PREFIX>_BATCH_SIZE
+# in .env, and latency is replaced by the measured value in METRICS_FILE if present.
+PROVIDERS = {
+    "bhashini": {
+        "script": "translate_bhashini_json.py",
+        "env_prefix": "BHASHINI",
+        "output_dir": "translated_files",
+        "batch_size": 1,
+        "dedup": False,
+        "reuse_cache": False,
+        "latency_seconds": 1.0,
+        "request_delay_seconds": 0.0,
+        "language_delay_seconds": 15.0,
+        "setup_requests_per_language": 1,  # pipeline config lookup
+        "requests_per_minute": None,
+    },
+    "google_cloud": {
+        "script": "translate_gemini_json.py",
+        "env_prefix": "GOOGLE_CLOUD",
+        "output_dir": "google_translated_files",
+        "batch_size": 1,
+        "dedup": False,
+        "reuse_cache": False,
+        "latency_seconds": 0.3,
+        "request_delay_seconds": 0.1,
+        "language_delay_seconds": 0.0,
+        "setup_requests_per_language": 0,
+        "requests_per_minute": None,
+    },
+    "googletrans": {
+        "script": "google_ttranslate.py",
+        "env_prefix": "GOOGLETRANS",
+        "output_dir": "google_ttranslated_files",
+        "batch_size": 1,
+        "dedup": False,
+        "reuse_cache": False,
+        "latency_seconds": 0.5,
+        "request_delay_seconds": 0.1,
+        "language_delay_seconds": 0.0,
+        "setup_requests_per_language": 0,
+        "requests_per_minute": None,
+    },
+}
+
+# Latency measured by previous runs, keyed by provider name
+METRICS_FILE = "translation_metrics.json"
+
+def load_env():
+    """Load environment variables from .env file manually."""
+    env_path = ".env"
+    if os.path.exists(env_path):
+        with open(env_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    try:
+                        key, value = line.split("=", 1)
+                        os.environ[key] = value
+                    except ValueError:
+                        pass
+
+def load_metrics() -> Dict:
+    """
+    Loads latency measurements recorded by previous runs, or {} if there are none.
+    """
+    if not os.path.exists(METRICS_FILE):
+        return {}
+    try:
+        with open(METRICS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable metrics file {METRICS_FILE}: {e}")
+        return {}
+
+def record_latency(provider: str, total_seconds: float, requests_made: int):
+    """
+    Folds the latency observed during a run into METRICS_FILE so later plans can use it.
+    """
+    if requests_made <= 0:
+        return
+    metrics = load_metrics()
+    entry = metrics.get(provider, {"requests": 0, "total_seconds": 0.0})
+    entry["requests"] += requests_made
+    entry["total_seconds"] += total_seconds
+    entry["latency_seconds"] = entry["total_seconds"] / entry["requests"]
+    metrics[provider] = entry
+    output_writer.write_atomic(METRICS_FILE, metrics)
+
+def resolve_settings(provider: str, metrics: Optional[Dict] = None) -> Dict:
+    """
+    Returns the provider settings with .env overrides and measured latency applied.
+    """
+    settings = dict(PROVIDERS[provider])
+    settings["latency_source"] = "default"
+
+    measured = (metrics or {}).get(provider, {}).get("latency_seconds")
+    if measured is not None:
+        settings["latency_seconds"] = measured
+        settings["latency_source"] = "measured"
+
+    prefix = settings["env_prefix"]
+    overrides = {
+        "latency_seconds": (f"{prefix}_LATENCY_SECONDS", float),
+        "requests_per_minute": (f"{prefix}_REQUESTS_PER_MINUTE", float),
+        "batch_size": (f"{prefix}_BATCH_SIZE", int),
+    }
+    for field, (env_name, cast) in overrides.items():
+        value = os.environ.get(env_name)
+        if value:
+            try:
+                settings[field] = cast(value)
+                if field == "latency_seconds":
+                    settings["latency_source"] = "configured"
+            except ValueError:
+                print(f"Ignoring invalid {env_name}={value!r}")
+    return settings
+
+def extract_segments(data: Any, translate_keys: List[str] = None) -> List[str]:
+    """
+    Collects the strings that would be translated, in the order the scripts visit them.
+    """
+    if translate_keys is None:
+        translate_keys = TRANSLATE_KEYS
+    segments = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in translate_keys:
+                if isinstance(value, str) and value.strip():
+                    segments.append(value)
+                elif isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, str) and item.strip():
+                            segments.append(item)
+            else:
+                segments.extend(extract_segments(value, translate_keys))
+    elif isinstance(data, list):
+        for item in data:
+            segments.extend(extract_segments(item, translate_keys))
+    return segments
+
+def collect_translations(original: Any, translated: Any, found: Dict[str, str] = None,
+                         translate_keys: List[str] = None) -> Dict[str, str]:
+    """
+    Walks an original document alongside a previously translated copy and returns
+    a source -> translation map. Segments echoed back untranslated are left out,
+    since the scripts return the source text when a request fails.
+    """
+    if found is None:
+        found = {}
+    if translate_keys is None:
+        translate_keys = TRANSLATE_KEYS
+    if isinstance(original, dict) and isinstance(translated, dict):
+        for key, value in original.items():
+            if key not in translated:
+                continue
+            other = translated[key]
+            if key in translate_keys:
+                if isinstance(value, str) and isinstance(other, str):
+                    pairs = [(value, other)]
+                elif isinstance(value, list) and isinstance(other, list):
+                    pairs = zip(value, other)
+                else:
+                    pairs = []
+                for source, target in pairs:
+                    if isinstance(source, str) and isinstance(target, str) \
+                            and source.strip() and target != source:
+                        found[source] = target
+            else:
+                collect_translations(value, other, found, translate_keys)
+    elif isinstance(original, list) and isinstance(translated, list):
+        for source, target in zip(original, translated):
+            collect_translations(source, target, found, translate_keys)
+    return found
+
+def load_cache(original_data: Any, output_dir: str, lang_code: str,
+               translate_keys: List[str] = None) -> Dict[str, str]:
+    """
+    Builds the translation cache for one language from an earlier output file.
+    """
+    candidates = [(path, opener) for path, opener in (
+        (os.path.join(output_dir, f"ACBP_{lang_code}.json"), open),
+        (os.path.join(output_dir, f"ACBP_{lang_code}.json.gz"), gzip.open),
+    ) if os.path.exists(path)]
+    if not candidates:
+        return {}
+    # Older runs may have left both formats behind; the newer one is current
+    path, opener = max(candidates, key=lambda candidate: os.path.getmtime(candidate[0]))
+    try:
+        with opener(path, 'rt', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable cache file {path}: {e}")
+        return {}
+    return collect_translations(original_data, previous, translate_keys=translate_keys)
+
+def plan_language(segments: List[str], cache: Dict[str, str], settings: Dict) -> Dict:
+    """
+    Works out the segments, characters, requests and time for one provider/language pair.
+    """
+    unique = list(dict.fromkeys(segments))
+    cache_hits = sum(1 for text in unique if text in cache)
+
+    # What the provider will actually be sent, given how its script behaves
+    to_send = unique if settings["dedup"] else segments
+    if settings["reuse_cache"]:
+        to_send = [text for text in to_send if text not in cache]
+
+    batch_size = max(1, settings["batch_size"])
+    requests_count = math.ceil(len(to_send) / batch_size)
+    total_requests = requests_count + settings["setup_requests_per_language"]
+
+    seconds = requests_count * (settings["latency_seconds"] + settings["request_delay_seconds"])
+    rpm = settings["requests_per_minute"]
+    if rpm:
+        seconds = max(seconds, total_requests / rpm * 60)
+    seconds += settings["language_delay_seconds"]
+
+    return {
+        "segments": len(segments),
+        "unique_segments": len(unique),
+        "unique_characters": sum(len(text) for text in unique),
+        "cache_hits": cache_hits,
+        "characters_sent": sum(len(text) for text in to_send),
+        "requests": total_requests,
+        "estimated_seconds": seconds,
+    }
+
+def build_plan(original_data: Any, providers: List[str] = None, languages: List[str] = None,
+               translate_keys: List[str] = None) -> Dict:
+    """
+    Runs extraction, de-duplication, cache lookup and batching without any network
+    calls and returns {provider: {"settings": ..., "languages": {lang: plan}}}.
+    """
+    providers = providers or list(PROVIDERS)
+    languages = languages or list(TARGET_LANGUAGES)
+    segments = extract_segments(original_data, translate_keys)
+    metrics = load_metrics()
+
+    plan = {}
+    for provider in providers:
+        settings = resolve_settings(provider, metrics)
+        per_language = {}
+        for lang_code in languages:
+            cache = load_cache(original_data, settings["output_dir"], lang_code, translate_keys)
+            per_language[lang_code] = plan_language(segments, cache, settings)
+        plan[provider] = {"settings": settings, "languages": per_language}
+    return plan
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{secs:02d}s"
+
+def print_plan(plan: Dict):
+    """
+    Prints the plan as one table per provider with per-provider totals.
+    """
+    header = f"{'lang':<6}{'segments':>10}{'unique':>8}{'uniq chars':>12}{'sent chars':>12}{'cached':>8}{'requests':>10}{'est. time':>12}"
+    for provider, entry in plan.items():
+        settings = entry["settings"]
+        rpm = settings["requests_per_minute"]
+        print(f"\n=== {provider} ({settings['script']}) ===")
+        print(f"latency {settings['latency_seconds']:.2f}s ({settings['latency_source']}), "
+              f"batch size {settings['batch_size']}, "
+              f"rate limit {f'{rpm:g}/min' if rpm else 'none configured'}")
+        print(header)
+
+        totals = {"segments": 0, "unique_segments": 0, "unique_characters": 0, "cache_hits": 0,
+                  "characters_sent": 0, "requests": 0, "estimated_seconds": 0.0}
+        for lang_code, row in entry["languages"].items():
+            print(f"{lang_code:<6}{row['segments']:>10}{row['unique_segments']:>8}"
+                  f"{row['unique_characters']:>12}{row['characters_sent']:>12}{row['cache_hits']:>8}{row['requests']:>10}"
+                  f"{format_duration(row['estimated_seconds']):>12}")
+            for key in totals:
+                totals[key] += row[key]
+        print(f"{'total':<6}{totals['segments']:>10}{totals['unique_segments']:>8}"
+              f"{totals['unique_characters']:>12}{totals['characters_sent']:>12}{totals['cache_hits']:>8}{totals['requests']:>10}"
+              f"{format_duration(totals['estimated_seconds']):>12}")
+        print(f"Quota use: {totals['requests']} requests, {totals['characters_sent']} characters sent")
+
+def main():
+    parser = argparse.ArgumentParser(description="Dry-run workload and cost plan for the translation scripts.")
+    parser.add_argument("--provider", action="append", choices=list(PROVIDERS),
+                        help="Provider to plan for (repeatable, default: all)")
+    parser.add_argument("--lang", action="append", choices=list(TARGET_LANGUAGES),
+                        help="Target language code (repeatable, default: all)")
+    args = parser.parse_args()
+
+    load_env()
+
+    if not os.path.exists(INPUT_FILE):
+        print(f"Input file {INPUT_FILE} not found.")
+        return
+
+    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+        original_data = json.load(f)
+
+    print_plan(build_plan(original_data, args.provider, args.lang))
+
+if __name__ == "__main__":
+    main()